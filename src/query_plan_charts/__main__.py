@@ -1,5 +1,6 @@
 import argparse
 import logging
+import os
 import sys
 
 try:
@@ -7,7 +8,7 @@ try:
 except ModuleNotFoundError:
     import tomli as tomllib  # type: ignore
 
-from . import run_0d, run_1d, run_2d
+from . import OUTPUT_EXTENSIONS, run_0d, run_single_case
 from .base import ParameterConfig, ParameterizedStatement
 
 
@@ -18,8 +19,32 @@ def main():
     parser.add_argument("-v", "--verbose", action="count",
                         help="Verbosity level. "
                         "This may be specified up to three times.")
+    parser.add_argument("-o", "--output", action="append", metavar="PATH",
+                        help="Write charts to a .png, .svg, or .html file "
+                        "instead of showing them interactively. "
+                        "This may be specified multiple times.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true",
+                      help="Validate the configuration file and exit, "
+                      "without starting a database.")
+    mode.add_argument("--plan-only", action="store_true",
+                      help="Print the query plan for a single case, using "
+                      "the starting value of each parameter.")
+    parser.add_argument("--compact-ranges", action="store_true",
+                        help="Report parameter values of each equivalence "
+                        "class as run-length ranges.")
     args = parser.parse_args()
 
+    # Check output paths before doing any work, so that a typo doesn't throw
+    # away the results of a long run.
+    for path in args.output or []:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in OUTPUT_EXTENSIONS:
+            parser.error(
+                f"unsupported file extension for output {path!r}, expected "
+                "one of " + ", ".join(OUTPUT_EXTENSIONS)
+            )
+
     logging.basicConfig()
     if not args.verbose:
         logging.getLogger().setLevel(logging.ERROR)
@@ -134,6 +159,27 @@ def main():
                 else:
                     name = ""
 
+                # Parameter values are spaced logarithmically, and a run needs
+                # at least two distinct values for each parameter.
+                if raw_parameter["start"] <= 0 or raw_parameter["stop"] <= 0:
+                    print(
+                        "Values for 'start' and 'stop' must be positive",
+                        file=sys.stderr,
+                    )
+                    sys.exit(1)
+                if raw_parameter["start"] == raw_parameter["stop"]:
+                    print(
+                        "Values for 'start' and 'stop' must be different",
+                        file=sys.stderr,
+                    )
+                    sys.exit(1)
+                if raw_parameter["steps"] < 2:
+                    print(
+                        "Value for 'steps' must be at least 2",
+                        file=sys.stderr,
+                    )
+                    sys.exit(1)
+
                 parameters.append(ParameterConfig(
                     raw_parameter["start"],
                     raw_parameter["stop"],
@@ -151,15 +197,38 @@ def main():
     if len(parameters) > 2:
         print("Too many parameters in queries", file=sys.stderr)
         sys.exit(1)
+    # Only two-parameter runs draw charts and report parameter values, so
+    # don't let these options be silently ignored otherwise.
+    if (args.output or args.compact_ranges) and (
+            len(parameters) != 2 or args.plan_only):
+        parser.error(
+            "--output and --compact-ranges require a configuration with two "
+            "parameters, and can't be combined with --plan-only"
+        )
+
+    if args.check:
+        print(f"{args.configuration}: OK ({len(setup_statements)} setup "
+              f"statements, {len(parameters)} parameters)")
+    elif args.plan_only:
+        plan = run_single_case(
+            setup_statements,
+            [parameter.start for parameter in parameters],
+            config_dict["target_query"],
+        )
+        print(plan.text())
     elif len(parameters) == 2:
+        from .charts import run_2d
         run_2d(
             setup_statements,
             parameters[0],
             parameters[1],
             config_dict["target_query"],
             title,
+            outputs=args.output,
+            compact_ranges=args.compact_ranges,
         )
     elif len(parameters) == 1:
+        from .charts import run_1d
         run_1d(
             setup_statements,
             parameters[0],
@@ -0,0 +1,328 @@
+import html
+import io
+import itertools
+import os
+
+import numpy
+from matplotlib.cm import get_cmap  # type: ignore
+from matplotlib.colors import NoNorm  # type: ignore
+from matplotlib.figure import Figure  # type: ignore
+from matplotlib.ticker import FuncFormatter, MultipleLocator  # type: ignore
+import tqdm
+
+from . import OUTPUT_EXTENSIONS, EquivalenceClasses, run_single_case
+from .base import ParameterizedStatement, ParameterConfig
+
+
+# Grids with at least this many cells have their meshes rasterized when
+# written to vector output formats, to keep file sizes and rendering time
+# manageable.
+RASTERIZE_THRESHOLD = 10_000
+
+
+def choose_parameter_values(start, end, max_steps):
+    array = numpy.geomspace(start, end, max_steps)
+    array = numpy.rint(array)
+    array = numpy.asarray(array, dtype="int")
+    array = numpy.unique(array)
+    # Iterate from largest to smallest so that the user can quickly determine
+    # if parameters are so large that they make setup queries too slow.
+    array = numpy.flip(array)
+    return array
+
+
+def centers_to_boundaries(centers):
+    """
+    Take an array of N center coordinates, and interpolate and extend it into
+    N + 1 boundary coordinates. The geometric mean between any two points is
+    chosen as a boundary, to align with the logarithmic scale used throughout.
+    """
+    temp = numpy.sqrt(numpy.multiply(centers[:-1], centers[1:]))
+    first = temp[0] / (centers[1] / centers[0])
+    last = temp[-1] * (centers[-1] / centers[-2])
+    return numpy.concatenate(([first], temp, [last]))
+
+
+def run_1d(setup_statements: list[ParameterizedStatement],
+           parameter: ParameterConfig,
+           target_query: str,
+           _title: str):
+    parameter_values = choose_parameter_values(
+        parameter.start, parameter.stop, parameter.steps)
+
+    if len(parameter_values) <= 1:
+        raise Exception(
+            "Degenerate input, the parameter can only take on a single value"
+        )
+
+    equivalence_classes = EquivalenceClasses()
+    # Flatten the iterator from `enumerate` into a list, so that tqdm can see
+    # its length and show a progress bar.
+    enumerated = list(enumerate(parameter_values.tolist()))
+    for (i, parameter_value) in tqdm.tqdm(enumerated):
+        plan = run_single_case(
+            setup_statements, [parameter_value], target_query)
+        equivalence_classes.add(i, plan)
+
+
+def run_2d(setup_statements: list[ParameterizedStatement],
+           parameter_1: ParameterConfig,
+           parameter_2: ParameterConfig,
+           target_query: str,
+           title: str,
+           outputs: list[str] | None = None,
+           compact_ranges: bool = False):
+    # First parameter: x-axis, column index of numpy 2D arrays, and thus the
+    # second index when indexing an array. Index variable `i`.
+    # Second parameter: y-axis, row index of numpy 2D arrays, and thus the
+    # first index when indexing an array. Index variable `j`.
+    parameter_1_values = choose_parameter_values(
+        parameter_1.start, parameter_1.stop, parameter_1.steps)
+    parameter_2_values = choose_parameter_values(
+        parameter_2.start, parameter_2.stop, parameter_2.steps)
+
+    if len(parameter_1_values) <= 1 or len(parameter_2_values) <= 1:
+        raise Exception(
+            "Degenerate input, one of the parameters can only take on a "
+            "single value"
+        )
+
+    # Evaluate the query plan with every combination of parameter values.
+    parameter_pairs = list(itertools.product(
+        enumerate(parameter_1_values.tolist()),
+        enumerate(parameter_2_values.tolist()),
+    ))
+    equivalence_classes = EquivalenceClasses()
+    colors = numpy.zeros(
+        (len(parameter_2_values), len(parameter_1_values)),
+        dtype="int8",
+    )
+    costs = numpy.zeros(
+        (len(parameter_2_values), len(parameter_1_values)),
+        dtype="float64",
+    )
+    for ((i, value_1), (j, value_2)) in tqdm.tqdm(parameter_pairs):
+        plan = run_single_case(
+            setup_statements, [value_1, value_2], target_query)
+        class_idx = equivalence_classes.add((i, j), plan)
+        colors[j, i] = class_idx
+        costs[j, i] = plan.cost()
+    class_count = len(equivalence_classes.classes)
+
+    figures = plot_2d(
+        parameter_1,
+        parameter_2,
+        parameter_1_values,
+        parameter_2_values,
+        equivalence_classes,
+        colors,
+        costs,
+        title,
+        headless=bool(outputs),
+    )
+
+    # Print more detailed information on each equivalence class to stdout,
+    # including a representative text-format query plan.
+    membership = class_membership(colors, class_count)
+    for (i, klass) in enumerate(equivalence_classes.classes):
+        print(f"Equivalence class {i}")
+        idx_1, idx_2 = membership[i]
+        param_values = format_parameter_values(
+            idx_1,
+            idx_2,
+            parameter_1_values,
+            parameter_2_values,
+            compact_ranges,
+        )
+        print("Parameter values: {}".format(", ".join(param_values)))
+        print(klass.members[0].summary())
+        print(klass.highest_cost_plan().text())
+        print()
+
+    if outputs:
+        for path in outputs:
+            save_figures(figures, path)
+    else:
+        import matplotlib.pyplot  # type: ignore
+        matplotlib.pyplot.show()
+
+
+def class_membership(colors, class_count):
+    """
+    Group the cells of a 2D grid of equivalence class indices by class.
+    Returns a list with one `(idx_1, idx_2)` pair of index arrays per class.
+    Within each class, cells are ordered by the first parameter's value, then
+    by the second parameter's value, ascending. (parameter values are chosen
+    in descending order, so this is descending index order)
+    """
+    row_count = colors.shape[0]
+    # Transposing makes flat indices run over the second parameter fastest,
+    # and reversing them makes parameter values ascend.
+    flat = colors.T.ravel()[::-1]
+    # A stable sort keeps each class's cells in the order above.
+    order = numpy.argsort(flat, kind="stable")
+    flat_indices = flat.size - 1 - order
+    idx_1 = flat_indices // row_count
+    idx_2 = flat_indices % row_count
+    counts = numpy.bincount(flat, minlength=class_count)
+    splits = numpy.cumsum(counts)[:-1]
+    return list(zip(numpy.split(idx_1, splits), numpy.split(idx_2, splits)))
+
+
+def format_parameter_values(idx_1, idx_2, parameter_1_values,
+                            parameter_2_values, compact_ranges=False):
+    """
+    Format the parameter values for one equivalence class, given index
+    arrays in the order produced by `class_membership`. If `compact_ranges`
+    is set, consecutive values of the second parameter that share the same
+    value of the first parameter are collapsed into one range.
+    """
+    values_1 = parameter_1_values[idx_1]
+    values_2 = parameter_2_values[idx_2]
+    if not compact_ranges:
+        return [f"({value_1}, {value_2})"
+                for (value_1, value_2)
+                in zip(values_1.tolist(), values_2.tolist())]
+
+    if len(idx_1) == 0:
+        return []
+    # A run continues while the first index stays the same, and the second
+    # index steps down by one.
+    breaks = (numpy.diff(idx_1) != 0) | (numpy.diff(idx_2) != -1)
+    starts = numpy.concatenate(([0], numpy.nonzero(breaks)[0] + 1))
+    ends = numpy.concatenate((starts[1:] - 1, [len(idx_1) - 1]))
+    result = []
+    for (value_1, first, last) in zip(values_1[starts].tolist(),
+                                      values_2[starts].tolist(),
+                                      values_2[ends].tolist()):
+        if first == last:
+            result.append(f"({value_1}, {first})")
+        else:
+            result.append(f"({value_1}, {first}..{last})")
+    return result
+
+
+def plot_2d(parameter_1: ParameterConfig,
+            parameter_2: ParameterConfig,
+            parameter_1_values,
+            parameter_2_values,
+            equivalence_classes: EquivalenceClasses,
+            colors,
+            costs,
+            title: str,
+            headless: bool = False):
+    """
+    Build the plan topology chart and the cost surface chart. Returns a
+    dictionary of figures, keyed by a short name. If `headless` is set, the
+    figures are not registered with pyplot, so no GUI backend is needed.
+    """
+    class_count = len(equivalence_classes.classes)
+    rasterized = colors.size >= RASTERIZE_THRESHOLD
+
+    def new_figure(**kwargs):
+        if headless:
+            fig = Figure()
+            return fig, fig.subplots(**kwargs)
+        # Loading pyplot selects a GUI backend, so only do so when needed.
+        import matplotlib.pyplot  # type: ignore
+        return matplotlib.pyplot.subplots(**kwargs)
+
+    # Calculate node coordinates for the `pcolormesh` quads, such that each
+    # parameter choice is in the center of a quad. (on a log-log plot)
+    mesh_x = centers_to_boundaries(parameter_1_values)
+    mesh_y = centers_to_boundaries(parameter_2_values)
+
+    # Make the `pcolormesh` plot, and associated color bar. Color each plan
+    # based on how we divided them into equivalence classes by topology.
+    plans_fig, ax = new_figure()
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    color_map = get_cmap("viridis", class_count)
+    norm = NoNorm(vmin=0, vmax=class_count - 1)
+    quadmesh = ax.pcolormesh(
+        mesh_x,
+        mesh_y,
+        colors,
+        cmap=color_map,
+        norm=norm,
+        rasterized=rasterized,
+    )
+    ax.set_title(title)
+    ax.set_xlabel(parameter_1.name)
+    ax.set_ylabel(parameter_2.name)
+    colorbar = plans_fig.colorbar(
+        quadmesh,
+    )
+    colorbar.set_ticks(
+        list(range(class_count)),
+        labels=[cls.members[0].summary()
+                for cls in equivalence_classes.classes],
+        wrap=True,
+    )
+    colorbar.ax.invert_yaxis()
+
+    # Make a 3D surface plot of the query plan cost. 3D plots do not support
+    # log scale, so we pre-transform the data instead and use substitute tick
+    # labels.
+    cost_fig, ax = new_figure(subplot_kw={"projection": "3d"})
+    surf_x, surf_y = numpy.meshgrid(
+        numpy.log10(parameter_1_values),
+        numpy.log10(parameter_2_values),
+    )
+    ax.plot_surface(
+        surf_x,
+        surf_y,
+        costs,
+        rasterized=rasterized,
+    )
+    locator = MultipleLocator(1)
+    formatter = FuncFormatter(lambda val, _: "$10^{{{:.0f}}}$".format(val))
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(formatter)
+    ax.yaxis.set_major_locator(locator)
+    ax.yaxis.set_major_formatter(formatter)
+
+    return {"plans": plans_fig, "cost": cost_fig}
+
+
+def save_figures(figures, path: str):
+    """
+    Write figures to files, choosing the format based on the file extension.
+    PNG and SVG output produce one file per figure, with the figure's name
+    appended to the file name. HTML output produces a single page, with each
+    figure embedded as inline SVG.
+    """
+    stem, extension = os.path.splitext(path)
+    extension = extension.lower()
+    if extension not in OUTPUT_EXTENSIONS:
+        raise Exception(
+            f"Unsupported output format {extension!r}, expected one of "
+            + ", ".join(OUTPUT_EXTENSIONS)
+        )
+    if extension in (".png", ".svg"):
+        for (name, fig) in figures.items():
+            fig.savefig(f"{stem}-{name}{extension}")
+    else:
+        sections = []
+        for (name, fig) in figures.items():
+            buffer = io.StringIO()
+            fig.savefig(buffer, format="svg")
+            # Drop the XML declaration and doctype that precede the root
+            # element, as they aren't valid inside an HTML document.
+            svg = buffer.getvalue()
+            svg = svg[svg.index("<svg"):]
+            sections.append(
+                f'<figure id="{html.escape(name)}">\n'
+                f"{svg}\n"
+                "</figure>\n"
+            )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                "<!DOCTYPE html>\n"
+                "<html>\n"
+                '<head><meta charset="utf-8"></head>\n'
+                "<body>\n"
+                f"{''.join(sections)}"
+                "</body>\n"
+                "</html>\n"
+            )
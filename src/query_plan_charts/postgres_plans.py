@@ -1,11 +1,27 @@
-import psycopg
-from testcontainers.postgres import PostgresContainer  # type: ignore
+import logging
 
 from .base import Backend, QueryPlan
 
 
+def undo_testcontainers_logging_changes():
+    # Clear out extra logging handlers set up by the testcontainers library.
+    # These would result in some messages being printed twice.
+    logging.getLogger("testcontainers.core.container").handlers.clear()
+    logging.getLogger("testcontainers.core.waiting_utils").handlers.clear()
+
+    # Reset level on testcontainers loggers as well
+    logging.getLogger("testcontainers.core.container").setLevel(logging.NOTSET)
+    logging.getLogger("testcontainers.core.waiting_utils").setLevel(
+        logging.NOTSET)
+
+
 class Postgres(Backend):
     def __init__(self):
+        # The container library is slow to import, so defer loading it until
+        # a backend is actually needed.
+        from testcontainers.postgres import PostgresContainer  # type: ignore
+        undo_testcontainers_logging_changes()
+
         # We need to provide extra shared memory as the Docker default of 64MB
         # may not be enough for some large queries.
         self.container = PostgresContainer(
@@ -14,6 +30,8 @@ class Postgres(Backend):
         self.connection = None
 
     def __enter__(self):
+        import psycopg
+
         self.container.__enter__()
         connection_url = self.container.get_connection_url()
         connection_url = connection_url.replace(
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+
+import numpy
+
+from query_plan_charts import (
+    EquivalenceClass,
+    EquivalenceClasses,
+    class_membership,
+    format_parameter_values,
+    plot_2d,
+    save_figures,
+)
+from query_plan_charts.base import ParameterConfig, QueryPlan
+
+
+class FakePlan(QueryPlan):
+    def __init__(self, name):
+        self.name = name
+
+    def summary(self) -> str:
+        return self.name
+
+
+class TestClassMembership(unittest.TestCase):
+    def setUp(self):
+        # Parameter values are in descending order, as returned by
+        # `choose_parameter_values`.
+        self.parameter_1_values = numpy.array([100, 10, 1])
+        self.parameter_2_values = numpy.array([30, 20, 10, 5])
+        self.colors = numpy.array([
+            [0, 0, 1],
+            [0, 1, 1],
+            [0, 1, 2],
+            [0, 0, 2],
+        ], dtype="int8")
+
+    def test_matches_nested_loop(self):
+        # Compare against a straightforward loop over each class and cell,
+        # on a random grid.
+        rng = numpy.random.default_rng(0)
+        colors = rng.integers(0, 5, size=(7, 9)).astype("int8")
+        values_1 = numpy.arange(9, 0, -1)
+        values_2 = numpy.arange(70, 0, -10)
+        membership = class_membership(colors, 5)
+        self.assertEqual(len(membership), 5)
+        for i in range(5):
+            expected = []
+            for (idx_1, value_1) in enumerate(values_1):
+                for (idx_2, value_2) in enumerate(values_2):
+                    if colors[idx_2, idx_1] == i:
+                        expected.append(f"({value_1}, {value_2})")
+            idx_1, idx_2 = membership[i]
+            result = format_parameter_values(idx_1, idx_2, values_1, values_2)
+            self.assertEqual(result, expected[::-1])
+
+    def test_empty_class(self):
+        membership = class_membership(self.colors, 4)
+        idx_1, idx_2 = membership[3]
+        self.assertEqual(len(idx_1), 0)
+        self.assertEqual(
+            format_parameter_values(idx_1, idx_2, self.parameter_1_values,
+                                    self.parameter_2_values, True),
+            [],
+        )
+
+    def test_compact_ranges(self):
+        membership = class_membership(self.colors, 3)
+        results = [
+            format_parameter_values(idx_1, idx_2, self.parameter_1_values,
+                                    self.parameter_2_values, True)
+            for (idx_1, idx_2) in membership
+        ]
+        self.assertEqual(results, [
+            ["(10, 5)", "(10, 30)", "(100, 5..30)"],
+            ["(1, 20..30)", "(10, 10..20)"],
+            ["(1, 5..10)"],
+        ])
+
+
+class TestHeadlessOutput(unittest.TestCase):
+    def test_save_figures(self):
+        parameter_1_values = numpy.array([100, 10, 1])
+        parameter_2_values = numpy.array([20, 10])
+        colors = numpy.array([[0, 0, 1], [0, 1, 1]], dtype="int8")
+        costs = numpy.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        equivalence_classes = EquivalenceClasses()
+        equivalence_classes.classes = [
+            EquivalenceClass((0, 0), [FakePlan("Seq Scan")]),
+            EquivalenceClass((2, 0), [FakePlan("Index Scan")]),
+        ]
+        figures = plot_2d(
+            ParameterConfig(1, 100, 3, "x"),
+            ParameterConfig(10, 20, 2, "y"),
+            parameter_1_values,
+            parameter_2_values,
+            equivalence_classes,
+            colors,
+            costs,
+            "Title",
+            headless=True,
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            save_figures(figures, os.path.join(directory, "chart.png"))
+            save_figures(figures, os.path.join(directory, "chart.svg"))
+            save_figures(figures, os.path.join(directory, "chart.html"))
+            self.assertEqual(sorted(os.listdir(directory)), [
+                "chart-cost.png",
+                "chart-cost.svg",
+                "chart-plans.png",
+                "chart-plans.svg",
+                "chart.html",
+            ])
+            with open(os.path.join(directory, "chart.html")) as f:
+                page = f.read()
+            self.assertEqual(page.count("<svg"), 2)
+            self.assertNotIn("<?xml", page)
+            self.assertNotIn("<!DOCTYPE svg", page)
+
+            with self.assertRaises(Exception):
+                save_figures(figures, os.path.join(directory, "chart.pdf"))
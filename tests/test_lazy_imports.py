@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import query_plan_charts
+
+HEAVY_MODULES = [
+    "matplotlib",
+    "numpy",
+    "psycopg",
+    "testcontainers",
+    "tqdm",
+]
+SRC_DIR = os.path.dirname(os.path.dirname(query_plan_charts.__file__))
+SAMPLES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "samples")
+
+
+def run_python(*args, check=True):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [SRC_DIR, env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=check,
+    )
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_cli_import_is_light(self):
+        # Run in a fresh interpreter, since other tests will have already
+        # loaded these modules into this one.
+        result = run_python("-c", (
+            "import sys\n"
+            "import query_plan_charts.__main__\n"
+            "import query_plan_charts.postgres_plans\n"
+            "print(' '.join(sorted(sys.modules)))\n"
+        ))
+        loaded = {name.split(".")[0] for name in result.stdout.split()}
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, loaded)
+
+    def test_charts_names_are_reexported(self):
+        from query_plan_charts.charts import choose_parameter_values
+        self.assertIs(
+            query_plan_charts.choose_parameter_values,
+            choose_parameter_values,
+        )
+        with self.assertRaises(AttributeError):
+            query_plan_charts.does_not_exist
+
+    def test_check_mode(self):
+        path = os.path.join(SAMPLES_DIR, "collect_job_by_time.toml")
+        result = run_python("-m", "query_plan_charts", "--check", path)
+        self.assertTrue(result.stdout.startswith(f"{path}: OK"))
+
+    def test_bad_output_extension(self):
+        path = os.path.join(SAMPLES_DIR, "collect_job_by_time.toml")
+        result = run_python("-m", "query_plan_charts", "--check", path,
+                            "-o", "out.png", "-o", "out.jpg", check=False)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("out.jpg", result.stderr)
+
+    def test_output_requires_two_parameters(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "config.toml")
+            with open(path, "w") as f:
+                f.write(
+                    'setup_statements = [{statement = "SELECT %s", '
+                    'parameters = [{start = 1, stop = 10, steps = 5}]}]\n'
+                    'target_query = "SELECT 1"\n'
+                )
+            for option in (["-o", "out.png"], ["--compact-ranges"]):
+                result = run_python("-m", "query_plan_charts", "--check",
+                                    path, *option, check=False)
+                self.assertEqual(result.returncode, 2)
+                self.assertIn("two parameters", result.stderr)
+
+    def test_check_rejects_degenerate_parameters(self):
+        cases = [
+            ("start = 5, stop = 5, steps = 10", "must be different"),
+            ("start = 0, stop = 10, steps = 10", "must be positive"),
+            ("start = 1, stop = -10, steps = 10", "must be positive"),
+            ("start = 1, stop = 10, steps = 1", "at least 2"),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "config.toml")
+            for (parameter, message) in cases:
+                with open(path, "w") as f:
+                    f.write(
+                        'setup_statements = [{statement = "SELECT %s", '
+                        f"parameters = [{{{parameter}}}]}}]\n"
+                        'target_query = "SELECT 1"\n'
+                    )
+                result = run_python("-m", "query_plan_charts", "--check",
+                                    path, check=False)
+                self.assertEqual(result.returncode, 1)
+                self.assertIn(message, result.stderr)